@@ -1,15 +1,32 @@
 import os
-from datetime import datetime, timedelta
+import hashlib
+import hmac
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from flask import Flask, jsonify, request, g
 from flask_cors import CORS
 from web3 import Web3
 from web3.auto import w3
-from eth_account.messages import encode_defunct
+from eth_keys import keys
 import jwt
 import pymongo
+from bson import ObjectId
+import requests as http_requests
+from requests.adapters import HTTPAdapter, Retry
 from dotenv import load_dotenv
 import json
-from functools import wraps
+from functools import lru_cache, wraps
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
 
 load_dotenv()
 
@@ -21,19 +38,154 @@ app.config['SECRET_KEY'] = os.getenv('JWT_SECRET', 'monadmesh-super-secret')
 app.config['JWT_EXPIRATION_DELTA'] = timedelta(hours=24)
 
 # Web3 Initialization
-web3 = Web3(Web3.HTTPProvider(os.getenv('WEB3_PROVIDER_URL', 'https://mainnet.infura.io/v3/YOUR_INFURA_KEY')))
+# Share one keep-alive HTTP session across all RPC calls so we don't pay a
+# TCP+TLS handshake per call to the provider.
+rpc_session = http_requests.Session()
+rpc_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=Retry(total=2, backoff_factor=0.1))
+rpc_session.mount('https://', rpc_adapter)
+rpc_session.mount('http://', rpc_adapter)
+web3 = Web3(Web3.HTTPProvider(
+    os.getenv('WEB3_PROVIDER_URL', 'https://mainnet.infura.io/v3/YOUR_INFURA_KEY'),
+    session=rpc_session,
+    request_kwargs={'timeout': 10}
+))
 chain_id = int(os.getenv('CHAIN_ID', 1))  # Default to Ethereum Mainnet
 
 # Smart Contract
-with open('MonadMesh.json') as f:
-    contract_abi = json.load(f)['abi']
+# Built lazily so importing the module doesn't require MonadMesh.json on
+# disk; the first caller pays the one-time ABI parse (orjson's native
+# decoder when installed, stdlib json otherwise) and every later call gets
+# the cached object.
 contract_address = os.getenv('CONTRACT_ADDRESS')
-contract = web3.eth.contract(address=contract_address, abi=contract_abi)
+_contract = None
+
+def get_contract():
+    global _contract
+    if _contract is None:
+        with open('MonadMesh.json', 'rb') as f:
+            raw = f.read()
+        contract_abi = orjson.loads(raw)['abi'] if orjson is not None else json.loads(raw)['abi']
+        _contract = web3.eth.contract(address=contract_address, abi=contract_abi)
+    return _contract
 
 # MongoDB Initialization
-mongo_client = pymongo.MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017'))
+# Explicit pool sizing: keep a warm floor of sockets so hot auth paths never
+# pay the TCP/TLS handshake, and fail fast instead of queueing forever.
+mongo_client = pymongo.MongoClient(
+    os.getenv('MONGODB_URI', 'mongodb://localhost:27017'),
+    maxPoolSize=200,
+    minPoolSize=10,
+    maxIdleTimeMS=300000,
+    waitQueueTimeoutMS=2000,
+    serverSelectionTimeoutMS=2000,
+    socketTimeoutMS=5000,
+    retryWrites=True,
+    compressors='zstd,snappy,zlib'
+)
 db = mongo_client['monadmesh_prod']
 
+# Warm the connection pool at startup so the first requests don't eat the
+# cold-connection latency, and declare the indexes the query-hot lookups
+# rely on (create_index is a no-op once they exist). Non-fatal if Mongo
+# isn't reachable yet.
+try:
+    mongo_client.admin.command('ping')
+    db.users.create_index('wallet_address', unique=True)
+    db.functions.create_index([('owner', 1), ('created_at', -1)])
+    db.executions.create_index('caller')
+except pymongo.errors.PyMongoError:
+    pass
+
+@lru_cache(maxsize=65536)
+def _cached_checksum(address_lower):
+    return Web3.to_checksum_address(address_lower)
+
+def _to_checksum(address):
+    """Memoized checksum conversion.
+
+    to_checksum_address keccak-hashes the address on every call; addresses
+    are repeat-heavy per user, so cache on the lowercased form.
+    """
+    return _cached_checksum(address.lower())
+
+# Signature helpers
+EIP191_PREFIX = b"\x19Ethereum Signed Message:\n"
+
+def _eip191_hash(message):
+    """keccak256 of the EIP-191 'personal message' envelope.
+
+    Assembles the prefixed bytes directly against the precomputed prefix
+    and hashes via Web3.keccak, which dispatches to eth_hash's C Keccak
+    backend when one is installed — no per-call SignableMessage objects.
+    """
+    body = message.encode()
+    return bytes(Web3.keccak(EIP191_PREFIX + str(len(body)).encode() + body))
+
+def _normalize_signature(signature):
+    """Parse a 65-byte hex signature into an eth_keys Signature (v in {0, 1})."""
+    sig_bytes = bytes.fromhex(signature[2:] if signature.startswith('0x') else signature)
+    if len(sig_bytes) != 65:
+        raise ValueError('Signature must be 65 bytes')
+    v = sig_bytes[64]
+    if v >= 27:
+        v -= 27
+    return keys.Signature(sig_bytes[:64] + bytes([v]))
+
+def _recover_signer_pubkey(message, signature):
+    """Recover the signing public key of an EIP-191 personal message.
+
+    Goes straight to coincurve (libsecp256k1) when it's installed — some
+    installs leave eth_keys on its pure-Python fallback backend, which is
+    orders of magnitude slower for recovery.
+    """
+    message_hash = _eip191_hash(message)
+    sig = _normalize_signature(signature)
+    if coincurve is not None:
+        raw = coincurve.PublicKey.from_signature_and_message(
+            sig.to_bytes(), message_hash, hasher=None
+        ).format(compressed=False)
+        return keys.PublicKey(raw[1:])
+    return sig.recover_public_key_from_msg_hash(message_hash)
+
+def _pubkey_matches_signature(pubkey_hex, message, signature):
+    """Fast path: check a signature against a known public key.
+
+    A plain ECDSA verify is significantly cheaper than recovery, which has
+    to reconstruct the R point before it can derive the key.
+    """
+    try:
+        pubkey = keys.PublicKey(bytes.fromhex(pubkey_hex[2:] if pubkey_hex.startswith('0x') else pubkey_hex))
+        return pubkey.verify_msg_hash(_eip191_hash(message), _normalize_signature(signature))
+    except Exception:
+        return False
+
+def _utcnow():
+    """Timezone-aware replacement for the deprecated datetime.utcnow().
+
+    Handlers that stamp several fields should call this once and reuse the
+    value so one request carries one consistent timestamp.
+    """
+    return datetime.now(timezone.utc)
+
+# Auth nonces are stateless: HMAC(secret, wallet:timestamp) is recomputed at
+# verify time and compared in constant time, so issuing a nonce costs no
+# Mongo write and verifying costs no nonce lookup. The signed message embeds
+# the nonce, and the timestamp bounds replay to the validity window.
+NONCE_TTL = 300  # seconds
+
+def _make_nonce(wallet_address, timestamp):
+    payload = f"{wallet_address.lower()}:{timestamp}".encode()
+    return hmac.new(app.config['SECRET_KEY'].encode(), payload, 'sha256').hexdigest()
+
+# Cache of successfully validated JWTs, keyed by a digest of the raw token.
+# A hit replaces the HMAC verify + JSON decode with one dict lookup. Entries
+# expire at the token's own exp claim (capped at 5 minutes), and failed
+# validations are never cached.
+_token_cache = {}
+_token_cache_lock = threading.Lock()
+TOKEN_CACHE_MAX_SIZE = 10000
+TOKEN_CACHE_TTL = 300
+
 # Authentication Decorator
 def login_required(f):
     @wraps(f)
@@ -41,10 +193,25 @@ def login_required(f):
         auth_header = request.headers.get('Authorization')
         if not auth_header:
             return jsonify({'error': 'Authorization header missing'}), 401
-        
+
         try:
             token = auth_header.split(' ')[1]
-            payload = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
+            cache_key = hashlib.sha256(token.encode()).digest()
+            now = time.time()
+
+            payload = None
+            with _token_cache_lock:
+                cached = _token_cache.get(cache_key)
+                if cached and cached[1] > now:
+                    payload = cached[0]
+
+            if payload is None:
+                payload = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
+                with _token_cache_lock:
+                    if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+                        _token_cache.clear()
+                    _token_cache[cache_key] = (payload, min(payload['exp'], now + TOKEN_CACHE_TTL))
+
             g.current_user = payload['sub']
             g.wallet_address = payload['wallet_address']
         except jwt.ExpiredSignatureError:
@@ -69,27 +236,20 @@ def get_nonce():
             return jsonify({'error': 'Invalid Ethereum address'}), 400
         
         # Normalize address
-        wallet_address = web3.to_checksum_address(wallet_address)
-        
-        # Generate a secure random nonce
-        nonce = os.urandom(32).hex()
-        
-        # Store nonce in database with expiration (5 minutes)
-        db.users.update_one(
-            {'wallet_address': wallet_address},
-            {'$set': {
-                'nonce': nonce,
-                'nonce_expires_at': datetime.utcnow() + timedelta(minutes=5)
-            }},
-            upsert=True
-        )
-        
+        wallet_address = _to_checksum(wallet_address)
+
+        # Derive the nonce from the wallet and current time — nothing to
+        # store, so issuing a nonce touches neither Mongo nor the pool.
+        timestamp = int(time.time())
+        nonce = _make_nonce(wallet_address, timestamp)
+
         return jsonify({
             'nonce': nonce,
+            'timestamp': timestamp,
             'wallet_address': wallet_address,
             'chain_id': chain_id,
             'message': f"MonadMesh Auth: {nonce}",
-            'expires_in': 300  # 5 minutes in seconds
+            'expires_in': NONCE_TTL
         })
     
     except Exception as e:
@@ -102,59 +262,86 @@ def verify_signature():
         if not data:
             return jsonify({'error': 'No JSON data provided'}), 400
         
-        required_fields = ['wallet_address', 'signature']
+        required_fields = ['wallet_address', 'signature', 'timestamp']
         for field in required_fields:
             if field not in data:
                 return jsonify({'error': f'{field} is required'}), 400
-        
+
         wallet_address = data['wallet_address']
         signature = data['signature']
-        
+
         # Validate Ethereum address
         if not web3.is_address(wallet_address):
             return jsonify({'error': 'Invalid Ethereum address'}), 400
-        
-        wallet_address = web3.to_checksum_address(wallet_address)
-        
-        # Retrieve nonce from database
-        user = db.users.find_one({'wallet_address': wallet_address})
-        if not user or 'nonce' not in user:
-            return jsonify({'error': 'Nonce not found. Request a new nonce first.'}), 404
-        
-        # Check nonce expiration
-        if user.get('nonce_expires_at', datetime.min) < datetime.utcnow():
+
+        wallet_address = _to_checksum(wallet_address)
+
+        # Recompute the stateless nonce from the echoed timestamp — two
+        # SHA-256 calls replace the nonce fetch/consume round trip.
+        try:
+            timestamp = int(data['timestamp'])
+        except (TypeError, ValueError):
+            return jsonify({'error': 'timestamp must be an integer'}), 400
+
+        if not 0 <= time.time() - timestamp <= NONCE_TTL:
             return jsonify({'error': 'Nonce expired. Request a new one.'}), 401
-        
+
+        nonce = _make_nonce(wallet_address, timestamp)
+        if 'nonce' in data and not hmac.compare_digest(nonce, str(data['nonce'])):
+            return jsonify({'error': 'Invalid nonce'}), 401
+
         # Prepare the expected message
-        message = f"MonadMesh Auth: {user['nonce']}"
-        
-        # Verify the signature
-        try:
-            message_hash = encode_defunct(text=message)
-            signer = web3.eth.account.recover_message(message_hash, signature=signature)
-            signer = web3.to_checksum_address(signer)
-        except Exception as e:
-            return jsonify({'error': 'Signature verification failed', 'details': str(e)}), 401
-        
+        message = f"MonadMesh Auth: {nonce}"
+
+        # Verify the signature. When the user's public key is already on
+        # record from an earlier login a direct ECDSA verify suffices;
+        # otherwise recover the key from the signature and remember it.
+        user = db.users.find_one(
+            {'wallet_address': wallet_address},
+            {'_id': 1, 'pubkey': 1}
+        )
+        recovered_pubkey = None
+        if user and user.get('pubkey') and _pubkey_matches_signature(user['pubkey'], message, signature):
+            signer = wallet_address
+        else:
+            try:
+                recovered_pubkey = _recover_signer_pubkey(message, signature)
+                signer = _to_checksum(recovered_pubkey.to_address())
+            except Exception as e:
+                return jsonify({'error': 'Signature verification failed', 'details': str(e)}), 401
+
         if signer != wallet_address:
             return jsonify({'error': 'Signature does not match wallet address'}), 401
         
-        # Generate JWT token
+        # Generate JWT token. First-time wallets have no user document yet
+        # (get_nonce no longer upserts one), so mint the _id here and let
+        # the upsert below insert it.
+        now = _utcnow()
+        user_id = user['_id'] if user else ObjectId()
         token_payload = {
-            'sub': str(user.get('_id', '')),
+            'sub': str(user_id),
             'wallet_address': wallet_address,
-            'exp': datetime.utcnow() + app.config['JWT_EXPIRATION_DELTA']
+            'exp': now + app.config['JWT_EXPIRATION_DELTA']
         }
-        
+
         token = jwt.encode(token_payload, app.config['SECRET_KEY'], algorithm='HS256')
-        
-        # Update user record
+
+        # Single upsert records the login (and creates the account on first
+        # login), persisting the public key when this login had to recover
+        # it so the next login can take the verify fast path.
+        update_fields = {
+            'last_login': now,
+            'jwt_token': token
+        }
+        if recovered_pubkey is not None:
+            update_fields['pubkey'] = recovered_pubkey.to_hex()
         db.users.update_one(
             {'wallet_address': wallet_address},
-            {'$set': {
-                'last_login': datetime.utcnow(),
-                'jwt_token': token
-            }}
+            {
+                '$set': update_fields,
+                '$setOnInsert': {'_id': user_id, 'created_at': now}
+            },
+            upsert=True
         )
         
         return jsonify({
@@ -171,28 +358,52 @@ def verify_signature():
 @login_required
 def get_profile():
     try:
-        user = db.users.find_one(
-            {'wallet_address': g.wallet_address},
-            {'_id': 0, 'nonce': 0, 'nonce_expires_at': 0}
-        )
-        
+        # One aggregation instead of a user lookup plus two count queries —
+        # the $lookup sub-pipelines compute both counts server-side, so the
+        # whole profile costs a single Mongo round trip.
+        user = next(db.users.aggregate([
+            {'$match': {'wallet_address': g.wallet_address}},
+            {'$lookup': {
+                'from': 'functions',
+                'let': {'wallet': '$wallet_address'},
+                'pipeline': [
+                    {'$match': {'$expr': {'$eq': ['$owner', '$$wallet']}}},
+                    {'$count': 'count'}
+                ],
+                'as': 'functions_count'
+            }},
+            {'$lookup': {
+                'from': 'executions',
+                'let': {'wallet': '$wallet_address'},
+                'pipeline': [
+                    {'$match': {'$expr': {'$eq': ['$caller', '$$wallet']}}},
+                    {'$count': 'count'}
+                ],
+                'as': 'executions_count'
+            }},
+            {'$project': {
+                '_id': 0,
+                'wallet_address': 1,
+                'created_at': 1,
+                'last_login': 1,
+                'functions_count': {'$ifNull': [{'$arrayElemAt': ['$functions_count.count', 0]}, 0]},
+                'executions_count': {'$ifNull': [{'$arrayElemAt': ['$executions_count.count', 0]}, 0]}
+            }}
+        ]), None)
+
         if not user:
             return jsonify({'error': 'User not found'}), 404
-        
-        # Get user's functions and executions count
-        functions_count = db.functions.count_documents({'owner': g.wallet_address})
-        executions_count = db.executions.count_documents({'caller': g.wallet_address})
-        
+
         profile = {
             'wallet_address': user['wallet_address'],
             'registered_at': user.get('created_at', '').isoformat(),
             'last_login': user.get('last_login', '').isoformat(),
             'stats': {
-                'functions': functions_count,
-                'executions': executions_count
+                'functions': user['functions_count'],
+                'executions': user['executions_count']
             }
         }
-        
+
         return jsonify(profile)
     
     except Exception as e:
@@ -213,15 +424,13 @@ def link_wallet():
         if not web3.is_address(new_wallet_address):
             return jsonify({'error': 'Invalid Ethereum address'}), 400
         
-        new_wallet_address = web3.to_checksum_address(new_wallet_address)
+        new_wallet_address = _to_checksum(new_wallet_address)
         
         # Verify the new wallet owns the signature of the main wallet
         message = f"Link wallet {new_wallet_address} to {g.wallet_address}"
-        message_hash = encode_defunct(text=message)
-        
+
         try:
-            signer = web3.eth.account.recover_message(message_hash, signature=signature)
-            signer = web3.to_checksum_address(signer)
+            signer = _to_checksum(_recover_signer_pubkey(message, signature).to_address())
         except Exception as e:
             return jsonify({'error': 'Signature verification failed', 'details': str(e)}), 401
         
@@ -248,11 +457,30 @@ def link_wallet():
 @login_required
 def get_user_functions():
     try:
-        functions = list(db.functions.find(
-            {'owner': g.wallet_address},
+        # Keyset pagination over the (owner, created_at) index: 'cursor' is
+        # the created_at of the last function the client already has, so
+        # each page is an O(log n) index seek plus a linear read of 'limit'
+        # documents with no server-side sort stage.
+        try:
+            limit = min(int(request.args.get('limit', 50)), 200)
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+
+        query = {'owner': g.wallet_address}
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                query['created_at'] = {'$lt': datetime.fromisoformat(cursor)}
+            except ValueError:
+                return jsonify({'error': 'cursor must be an ISO 8601 timestamp'}), 400
+
+        # Iterate the cursor directly (in driver-sized batches) instead of
+        # materializing every document up front.
+        functions = db.functions.find(
+            query,
             {'_id': 1, 'name': 1, 'description': 1, 'status': 1, 'created_at': 1}
-        ).sort('created_at', -1))
-        
+        ).sort('created_at', -1).limit(limit).batch_size(128)
+
         return jsonify([{
             'id': str(func['_id']),
             'name': func.get('name', 'Unnamed Function'),
@@ -0,0 +1,28 @@
+"""Gunicorn configuration for the MonadMesh API.
+
+Run with:
+    gunicorn -c gunicorn.conf.py app:app
+
+The handlers are I/O-bound (Mongo round trips and Web3 RPC calls), so
+gevent workers let requests overlap on the shared connection pools instead
+of serializing behind the single-threaded Flask dev server, which remains
+only as the `python app.py` fallback for local development. Gunicorn's
+gevent worker monkey-patches the stdlib itself at fork, so pymongo/web3
+sockets become cooperative without any change to the app module.
+"""
+import multiprocessing
+import os
+
+bind = '0.0.0.0:' + os.getenv('PORT', '5000')
+
+worker_class = 'gevent'
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Recycle workers periodically so any slow leak in native deps can't grow
+# unbounded; jitter avoids all workers restarting at once.
+max_requests = 1000
+max_requests_jitter = 100
+
+timeout = 30
+keepalive = 5